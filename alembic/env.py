@@ -1,52 +1,32 @@
-import sqlalchemy as sa
-from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, ForeignKey, Enum
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config, create_engine
+from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from alembic import context
 import os
 
+from app._urls import to_sync_url
+from app.database import Base
+import app.models  # noqa: F401  (registers tables on Base.metadata)
+
 # this is the Alembic Config object
 config = context.config
 
-# Get DATABASE_URL from environment
-database_url = os.environ.get("DATABASE_URL", "sqlite:///./tasks.db")
-# Ensure it's sync SQLite for Alembic
-if "sqlite+aiosqlite" in database_url:
-    database_url = database_url.replace("sqlite+aiosqlite", "sqlite")
 
-config.set_main_option("sqlalchemy.url", database_url)
+def get_database_url() -> str:
+    """Get DATABASE_URL from environment as a sync URL"""
+    return to_sync_url(os.environ.get("DATABASE_URL", "sqlite:///./tasks.db"))
+
 
-# Interpret the config file for Python logging
-if config.config_file_name is not None:
+config.set_main_option("sqlalchemy.url", get_database_url())
+
+# Interpret the config file for Python logging, unless run in-process on a caller's connection
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
-# Import your models' Base metadata
-# This is a simple approach that doesn't import the whole app
-
-target_metadata = MetaData()
-
-# Define tables directly for migrations
-users_table = Table(
-    'users',
-    target_metadata,
-    Column('id', Integer, primary_key=True, index=True),
-    Column('username', String, unique=True, index=True, nullable=False),
-    Column('hashed_password', String, nullable=False),
-    Column('created_at', DateTime, default=sa.func.now()),
-)
-
-tasks_table = Table(
-    'tasks',
-    target_metadata,
-    Column('id', Integer, primary_key=True, index=True),
-    Column('title', String, nullable=False),
-    Column('description', String, nullable=True),
-    Column('status', Enum('PENDING', 'COMPLETED',
-           name='taskstatus'), default='PENDING'),
-    Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
-    Column('created_at', DateTime, default=sa.func.now()),
-)
+target_metadata = Base.metadata
+
+# Data migrations should batch their writes and stream their reads with
+# app.migration_helpers.bulk_copy / stream_rows rather than going row by row
 
 
 def run_migrations_offline() -> None:
@@ -57,6 +37,26 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
+        render_as_batch=url.startswith("sqlite"),
+        compare_type=True,
+        compare_server_default=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    """Run migrations on an open connection."""
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+        # SQLite can't ALTER most columns; batch mode recreates the table
+        render_as_batch=connection.dialect.name == "sqlite",
+        compare_type=True,
+        compare_server_default=True,
     )
 
     with context.begin_transaction():
@@ -65,19 +65,20 @@ def run_migrations_offline() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
-    connectable = create_engine(
-        config.get_main_option("sqlalchemy.url"),
+    # Callers such as the test suite can hand over a connection to migrate in-process
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        do_run_migrations(connection)
 
 
 if context.is_offline_mode():
@@ -0,0 +1,58 @@
+"""task status as string
+
+Revision ID: 5c3e9d2a7b41
+Revises: a0d5f0b57c16
+Create Date: 2026-10-15 11:42:10.215873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c3e9d2a7b41'
+down_revision: Union[str, None] = 'a0d5f0b57c16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+task_status_enum = sa.Enum('PENDING', 'COMPLETED', name='taskstatus')
+
+
+def upgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    if is_postgres:
+        op.alter_column('tasks', 'status', existing_type=task_status_enum,
+                        type_=sa.String(16), postgresql_using='status::text')
+
+    # The Enum column stored member names ('PENDING'); store the values instead
+    op.execute("UPDATE tasks SET status = lower(coalesce(status, 'pending'))")
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.alter_column('status', existing_type=task_status_enum, type_=sa.String(16),
+                              nullable=False, server_default='pending')
+        batch_op.create_check_constraint('ck_tasks_status', "status IN ('pending', 'completed')")
+
+    if is_postgres:
+        task_status_enum.drop(op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_constraint('ck_tasks_status', type_='check')
+        batch_op.alter_column('status', existing_type=sa.String(16), nullable=True,
+                              server_default=None)
+
+    op.execute("UPDATE tasks SET status = upper(status)")
+
+    if is_postgres:
+        task_status_enum.create(op.get_bind(), checkfirst=True)
+        op.alter_column('tasks', 'status', existing_type=sa.String(16),
+                        type_=task_status_enum, postgresql_using='status::taskstatus')
+    else:
+        with op.batch_alter_table('tasks', schema=None) as batch_op:
+            batch_op.alter_column('status', existing_type=sa.String(16), type_=task_status_enum)
@@ -0,0 +1,28 @@
+"""tasks user id covering index
+
+Revision ID: 7d2b4e6f8a13
+Revises: 5c3e9d2a7b41
+Create Date: 2026-10-15 11:31:02.418377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2b4e6f8a13'
+down_revision: Union[str, None] = '5c3e9d2a7b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_tasks_user_id', table_name='tasks')
+    op.create_index('ix_tasks_user_id', 'tasks', ['user_id', 'id'], unique=False,
+                    postgresql_include=['title', 'description', 'status', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_id', table_name='tasks')
+    op.create_index('ix_tasks_user_id', 'tasks', ['user_id'], unique=False)
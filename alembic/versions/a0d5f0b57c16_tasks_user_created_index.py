@@ -0,0 +1,27 @@
+"""tasks user created index
+
+Revision ID: a0d5f0b57c16
+Revises: e87fea5a71a6
+Create Date: 2026-10-15 11:17:37.904536
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a0d5f0b57c16'
+down_revision: Union[str, None] = 'e87fea5a71a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_tasks_user_id'), 'tasks', ['user_id'], unique=False)
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_created', table_name='tasks')
+    op.drop_index(op.f('ix_tasks_user_id'), table_name='tasks')
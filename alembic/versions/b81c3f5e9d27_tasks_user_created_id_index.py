@@ -0,0 +1,27 @@
+"""tasks user created id index
+
+Revision ID: b81c3f5e9d27
+Revises: 7d2b4e6f8a13
+Create Date: 2026-10-15 11:40:12.803514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81c3f5e9d27'
+down_revision: Union[str, None] = '7d2b4e6f8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_tasks_user_created', table_name='tasks')
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_user_created', table_name='tasks')
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', 'created_at'], unique=False)
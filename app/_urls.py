@@ -0,0 +1,29 @@
+# Async drivers are used by the app engine, sync drivers by Alembic
+_ASYNC_SCHEME_MAP = (
+    ("postgres://", "postgresql+asyncpg://"),
+    ("postgresql://", "postgresql+asyncpg://"),
+    ("sqlite://", "sqlite+aiosqlite://"),
+)
+
+_SYNC_SCHEME_MAP = (
+    ("postgresql+asyncpg://", "postgresql://"),
+    ("postgres://", "postgresql://"),
+    ("sqlite+aiosqlite://", "sqlite://"),
+)
+
+
+def _rewrite(url: str, scheme_map: tuple) -> str:
+    for prefix, replacement in scheme_map:
+        if url.startswith(prefix):
+            return replacement + url[len(prefix):]
+    return url
+
+
+def to_async_url(url: str) -> str:
+    """Rewrite a database URL to use an async driver"""
+    return _rewrite(url, _ASYNC_SCHEME_MAP)
+
+
+def to_sync_url(url: str) -> str:
+    """Rewrite a database URL to use a sync driver"""
+    return _rewrite(url, _SYNC_SCHEME_MAP)
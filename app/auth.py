@@ -1,13 +1,16 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
-from jose import JWTError, jwt
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import hmac
+import time
+from cachetools import TTLCache
+import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
-from app.config import settings
-from app.models import User
+from app.config import get_settings
 from app.schemas import TokenData
 
 # Password hashing
@@ -21,16 +24,54 @@ def get_password_hash(password: str) -> str:
     """Hash password"""
     return pwd_context.hash(password)
 
+# Checked against when a login names an unknown user; hashed once per process
+DUMMY_PASSWORD_HASH = get_password_hash("dummy-password-for-unknown-users")
+
+# bcrypt is CPU-bound; run it on a bounded pool instead of the event loop
+hash_executor = ThreadPoolExecutor(
+    max_workers=get_settings().AUTH_THREADPOOL_SIZE, thread_name_prefix="password-hash"
+)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_executor, verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash password without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_executor, get_password_hash, password)
+
+# Signing key and JWT settings resolved once instead of per call
+_SECRET_KEY = get_settings().SECRET_KEY.encode()
+_ALGORITHM = get_settings().ALGORITHM
+_ALGORITHMS = [_ALGORITHM]
+_DECODE_OPTIONS = {"require": ["exp", "sub", "uid"], "verify_aud": False}
+
+# Recently verified logins: credential digest -> password hash it matched
+login_cache = TTLCache(maxsize=5000, ttl=get_settings().LOGIN_CACHE_TTL_SECONDS)
+
+def _login_cache_key(username: str, password: str) -> bytes:
+    """Keyed digest of the credentials, so the cache never holds the password"""
+    return hmac.new(_SECRET_KEY, f"{username}\0{password}".encode(), hashlib.sha256).digest()
+
+def is_login_cached(username: str, password: str, hashed_password: str) -> bool:
+    """Check whether these credentials recently verified against this hash"""
+    cached_hash = login_cache.get(_login_cache_key(username, password))
+    return cached_hash is not None and hmac.compare_digest(cached_hash, hashed_password)
+
+def cache_login(username: str, password: str, hashed_password: str) -> None:
+    """Remember credentials that just verified against this hash"""
+    login_cache[_login_cache_key(username, password)] = hashed_password
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=15)
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode.update({"exp": int(time.time() + expires_delta.total_seconds())})
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=_ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str) -> TokenData:
@@ -42,32 +83,9 @@ def verify_token(token: str) -> TokenData:
     )
 
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
-    except JWTError:
+        payload = jwt.decode(token, _SECRET_KEY, algorithms=_ALGORITHMS, options=_DECODE_OPTIONS)
+        token_data = TokenData(username=payload["sub"], user_id=payload["uid"], exp=payload["exp"])
+    except jwt.InvalidTokenError:
         raise credentials_exception
 
     return token_data
-
-async def get_current_user(token: str, db: AsyncSession) -> User:
-    """Get current user from JWT token"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        token_data = verify_token(token)
-        result = await db.execute(select(User).where(User.username == token_data.username))
-        user = result.scalar_one_or_none()
-
-        if user is None:
-            raise credentials_exception
-
-        return user
-    except Exception:
-        raise credentials_exception
\ No newline at end of file
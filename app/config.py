@@ -1,48 +1,77 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
+from functools import lru_cache
+from pydantic import PrivateAttr, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import List
 import os
 import secrets
 
+from app._urls import to_async_url
+
+DEFAULT_SECRET_KEY = "your-secret-key-change-this-in-production"
+
 class Settings(BaseSettings):
     """Application settings"""
 
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./data/tasks.db"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: int = 30
+    LOG_SQL_SAMPLE_RATE: float = 0.0
 
     # Security
-    SECRET_KEY: str = "your-secret-key-change-this-in-production"
+    SECRET_KEY: str = DEFAULT_SECRET_KEY
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     API_KEY: str = "123456"
+    AUTH_THREADPOOL_SIZE: int = 8
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAXSIZE: int = 10000
+    LOGIN_CACHE_TTL_SECONDS: int = 300
+
+    # HTTP
+    CORS_ORIGINS: List[str] = []
+    ALLOWED_HOSTS: List[str] = []
 
     # App
     APP_NAME: str = "Task Management API"
     DEBUG: bool = False
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Set when SECRET_KEY was generated here rather than configured
+    _secret_key_generated: bool = PrivateAttr(default=False)
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore",
+    )
 
+    @model_validator(mode="after")
+    def apply_environment_overrides(self) -> "Settings":
+        """Resolve derived values once, after env parsing"""
         # Auto-generate secure secret key if using default
-        if self.SECRET_KEY == "your-secret-key-change-this-in-production":
+        if self.SECRET_KEY == DEFAULT_SECRET_KEY:
             self.SECRET_KEY = secrets.token_urlsafe(32)
+            self._secret_key_generated = True
 
-        # Handle Railway PostgreSQL URL if provided
-        database_url = os.getenv("DATABASE_URL")
-        if database_url:
-            # Convert postgres:// to postgresql+asyncpg:// for async support
-            if database_url.startswith("postgres://"):
-                self.DATABASE_URL = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-            elif database_url.startswith("postgresql://"):
-                self.DATABASE_URL = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-            else:
-                self.DATABASE_URL = database_url
+        # Railway hands out sync URLs; the app engine needs an async driver
+        self.DATABASE_URL = to_async_url(self.DATABASE_URL)
 
         # Set production mode if PORT is set (Railway environment)
-        if os.getenv("PORT"):
+        if os.environ.get("PORT"):
             self.DEBUG = False
 
-settings = Settings()
\ No newline at end of file
+        return self
+
+    @property
+    def secret_key_generated(self) -> bool:
+        """Whether SECRET_KEY is a random per-process key"""
+        return self._secret_key_generated
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build settings once per process"""
+    return Settings()
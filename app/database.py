@@ -1,39 +1,157 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
-from app.config import settings
+from typing import Dict, List
+from sqlalchemy import Table, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from app.config import get_settings
+import asyncio
 import logging
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
+# The engine is built at import, so read settings once here
+settings = get_settings()
+
+
+def _engine_options(database_url: str) -> dict:
+    """Connection pool options for the configured database"""
+    if database_url.startswith("sqlite"):
+        # In-memory databases only exist per connection, so share a single one
+        if ":memory:" in database_url:
+            return {
+                "poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False},
+            }
+        # File databases keep a real pool; otherwise aiosqlite opens a new
+        # connection and worker thread per checkout
+        return {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "connect_args": {"check_same_thread": False},
+        }
+
+    return {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True
+    echo=False,
+    future=True,
+    **_engine_options(settings.DATABASE_URL)
 )
 
-AsyncSessionLocal = sessionmaker(
+def set_sqlite_journal_mode(dbapi_connection, connection_record):
+    """Use WAL journaling so readers don't block the single writer"""
+    # Stored in the database file, so the first connection sets it for all
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Per-connection SQLite settings, applied once per pooled connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.close()
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    event.listen(engine.sync_engine, "first_connect", set_sqlite_journal_mode)
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+
+if settings.LOG_SQL_SAMPLE_RATE > 0:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        """Mark a sampled fraction of statements for logging"""
+        # Some DBAPI-level executes run without an execution context to hold the timer
+        if context is not None and random.random() < settings.LOG_SQL_SAMPLE_RATE:
+            context._query_started_at = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _log_sampled_query(conn, cursor, statement, parameters, context, executemany):
+        """Log sampled statements without their parameters"""
+        started_at = getattr(context, "_query_started_at", None)
+        # INFO, so a non-zero rate is visible under the default logging setup
+        if started_at is not None and logger.isEnabledFor(logging.INFO):
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            logger.info("SQL (%.2f ms): %s", elapsed_ms, statement[:200])
+
+AsyncSessionLocal = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
-Base = declarative_base()
+# Read-only sessions skip autoflush; they stay transactional because asyncpg
+# can only open the server-side cursor behind db.stream() inside a transaction
+AsyncSessionReadOnly = async_sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+)
+
+class Base(DeclarativeBase):
+    """Declarative base for all models"""
+    pass
 
 
 async def get_db():
-    """Get database session"""
+    """Get database session, rolled back if the request fails"""
     async with AsyncSessionLocal() as session:
         try:
             yield session
-        finally:
-            await session.close()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_db_ro():
+    """Get read-only database session"""
+    async with AsyncSessionReadOnly() as session:
+        yield session
+
+
+def _tables_by_dependency_level() -> List[List[Table]]:
+    """Group tables so each group only references tables in earlier groups"""
+    levels: Dict[Table, int] = {}
+    for table in Base.metadata.sorted_tables:
+        parents = [fk.column.table for fk in table.foreign_keys if fk.column.table is not table]
+        levels[table] = 1 + max((levels[parent] for parent in parents), default=-1)
+
+    groups: List[List[Table]] = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+    for table, level in levels.items():
+        groups[level].append(table)
+    return groups
+
+
+async def _create_table(table: Table):
+    async with engine.begin() as conn:
+        await conn.run_sync(table.create, checkfirst=True)
 
 
 async def create_tables():
     """Create database tables"""
     try:
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        if engine.dialect.name == "sqlite":
+            # Single writer, so concurrent DDL would only queue up
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+        else:
+            for group in _tables_by_dependency_level():
+                async with asyncio.TaskGroup() as tg:
+                    for table in group:
+                        tg.create_task(_create_table(table))
         logger.info("Database tables created successfully")
     except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+        logger.error("Error creating database tables: %s", e)
         raise
@@ -0,0 +1,46 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Chatty third-party loggers kept quiet unless explicitly raised
+QUIET_LOGGERS = ("sqlalchemy.engine", "aiosqlite")
+
+
+# The listener thread can outlive a redirected stdout (e.g. pytest capture)
+class _StdoutHandler(logging.StreamHandler):
+    """Write to whatever sys.stdout is when the record is emitted"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Configure application logging once at startup"""
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    # Same rule as basicConfig: leave an already configured root logger alone
+    if logging.getLogger().handlers:
+        return
+
+    # Request code only enqueues records; a listener thread formats and writes them
+    stream_handler = _StdoutHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Only merge the message arguments here; the stream handler applies LOG_FORMAT
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=level, handlers=[queue_handler])
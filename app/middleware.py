@@ -0,0 +1,40 @@
+import hmac
+import logging
+
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+# Plain ASGI rather than BaseHTTPMiddleware, which wraps every request in an extra task
+class APIKeyMiddleware:
+    """Reject requests to protected paths without a valid X-API-Key header"""
+
+    def __init__(self, app: ASGIApp, api_key: str, protected_prefix: str = "/tasks"):
+        self.app = app
+        self.api_key = api_key.encode()
+        self.protected_prefix = protected_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(self.protected_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        x_api_key = next((value for name, value in scope["headers"] if name == b"x-api-key"), None)
+        if x_api_key is None or not hmac.compare_digest(x_api_key, self.api_key):
+            logger.warning("Invalid API key attempt on %s", scope["path"])
+            response = ORJSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={"detail": "Invalid or missing API key"},
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,21 @@
+from typing import Any, Dict, Iterator, List, Sequence
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def bulk_copy(conn: Connection, table: Table, rows: Sequence[Dict[str, Any]],
+              batch: int = DEFAULT_BATCH_SIZE) -> None:
+    """Insert rows in executemany batches instead of one INSERT per row"""
+    for start in range(0, len(rows), batch):
+        conn.execute(table.insert(), rows[start:start + batch])
+
+
+def stream_rows(conn: Connection, stmt: Select,
+                batch: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Any]]:
+    """Page through a query with a server-side cursor instead of materializing it"""
+    result = conn.execution_options(stream_results=True).execute(stmt)
+    for partition in result.partitions(batch):
+        yield partition
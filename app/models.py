@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import String, DateTime, ForeignKey, Index, CheckConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
+from typing import List, Optional
 import enum
 
 from app.database import Base
@@ -16,25 +17,42 @@ class TaskStatus(str, enum.Enum):
 class User(Base):
     """User model"""
     __tablename__ = "users"
+    # Fetch id/created_at in the INSERT itself when saved through the unit of work
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
-    created_at = Column(DateTime, default=func.now())
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    username: Mapped[str] = mapped_column(String, unique=True, index=True)
+    hashed_password: Mapped[str] = mapped_column(String)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
 
-    tasks = relationship("Task", back_populates="user",
-                         cascade="all, delete-orphan")
+    # Never lazy-load collections under asyncio; use selectinload() explicitly
+    tasks: Mapped[List["Task"]] = relationship(back_populates="user",
+                                               cascade="all, delete-orphan",
+                                               lazy="raise_on_sql")
 
 
 class Task(Base):
     """Task model"""
     __tablename__ = "tasks"
-
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, nullable=False)
-    description = Column(String, nullable=True)
-    status = Column(Enum(TaskStatus), default=TaskStatus.PENDING)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=func.now())
-
-    user = relationship("User", back_populates="tasks")
+    __table_args__ = (
+        # Scanned backwards, serves the newest-first task list and its
+        # (created_at, id) keyset cursor without a sort
+        Index("ix_tasks_user_created", "user_id", "created_at", "id"),
+        # Owner-scoped single-task lookups; on Postgres the payload is included
+        # so get_task can be answered from the index alone
+        Index("ix_tasks_user_id", "user_id", "id",
+              postgresql_include=["title", "description", "status", "created_at"]),
+        CheckConstraint("status IN ('pending', 'completed')", name="ck_tasks_status"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    title: Mapped[str] = mapped_column(String)
+    description: Mapped[Optional[str]] = mapped_column(String)
+    # Plain string column; values are validated as TaskStatus by the schemas
+    status: Mapped[str] = mapped_column(String(16), default=TaskStatus.PENDING.value,
+                                        server_default=TaskStatus.PENDING.value)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now())
+
+    user: Mapped["User"] = relationship(back_populates="tasks", lazy="raise_on_sql")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional
 from app.models import TaskStatus
@@ -15,8 +15,7 @@ class UserResponse(UserBase):
     """User response schema"""
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TaskBase(BaseModel):
     """Base task schema"""
@@ -40,8 +39,7 @@ class TaskResponse(TaskBase):
     user_id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
     """Token response schema"""
@@ -50,4 +48,6 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     """Token data schema"""
-    username: Optional[str] = None
\ No newline at end of file
+    username: Optional[str] = None
+    user_id: Optional[int] = None
+    exp: Optional[int] = None
\ No newline at end of file
@@ -1,53 +1,49 @@
-import os
 import asyncio
+import shutil
 from pathlib import Path
 
 async def cleanup_database():
     """Clean up database and test artifacts"""
     print("🧹 Cleaning up database and test artifacts...")
+    removed = 0
 
-    # Remove database files
+    # Remove database files (including SQLite WAL/journal side files)
     db_files = [
         "tasks.db",
         "test.db",
         "tasks.db-journal",
-        "test.db-journal"
+        "test.db-journal",
+        "tasks.db-wal",
+        "test.db-wal",
+        "tasks.db-shm",
+        "test.db-shm"
     ]
 
     for db_file in db_files:
-        if os.path.exists(db_file):
-            os.remove(db_file)
-            print(f"   ✅ Removed {db_file}")
-
-    # Remove cache directories
-    cache_dirs = [
-        ".pytest_cache",
-        "__pycache__",
-        "tests/__pycache__",
-        "app/__pycache__",
-        ".coverage"
-    ]
-
-    for cache_dir in cache_dirs:
-        if os.path.exists(cache_dir):
-            if os.path.isfile(cache_dir):
-                os.remove(cache_dir)
-                print(f"   ✅ Removed {cache_dir}")
-            else:
-                import shutil
-                shutil.rmtree(cache_dir)
-                print(f"   ✅ Removed directory {cache_dir}")
-
-    # Remove .pyc files
-    for root, dirs, files in os.walk("."):
-        for file in files:
-            if file.endswith(".pyc"):
-                pyc_file = os.path.join(root, file)
-                os.remove(pyc_file)
-                print(f"   ✅ Removed {pyc_file}")
-
+        path = Path(db_file)
+        if path.exists():
+            path.unlink()
+            removed += 1
+
+    # Remove cache directories and coverage data
+    for cache_dir in [Path(".pytest_cache"), *Path(".").rglob("__pycache__")]:
+        if cache_dir.is_dir():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            removed += 1
+
+    coverage_file = Path(".coverage")
+    if coverage_file.exists():
+        coverage_file.unlink()
+        removed += 1
+
+    # Remove stray .pyc files outside __pycache__
+    for pyc_file in Path(".").rglob("*.pyc"):
+        pyc_file.unlink(missing_ok=True)
+        removed += 1
+
+    print(f"   ✅ Removed {removed} files and directories")
     print("✨ Cleanup complete! Database and cache cleared.")
     print("🧪 You can now run tests with a fresh state.")
 
 if __name__ == "__main__":
-    asyncio.run(cleanup_database())
\ No newline at end of file
+    asyncio.run(cleanup_database())
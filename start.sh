@@ -38,4 +38,4 @@ echo "Starting FastAPI application..."
 echo "Listening on 0.0.0.0:${PORT:-8000}"
 
 # Start the FastAPI application
-exec uvicorn main:app --host 0.0.0.0 --port ${PORT:-8000} --workers 1 --loop asyncio --log-level error
+exec uvicorn main:app --host 0.0.0.0 --port ${PORT:-8000} --workers ${WEB_CONCURRENCY:-1} --loop uvloop --http httptools --log-level error
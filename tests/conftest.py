@@ -1,34 +1,50 @@
 import pytest
+import pytest_asyncio
 import asyncio
 import os
-from subprocess import run, PIPE
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from app.database import Base, get_db
-from app.config import settings
-from main import app
+from alembic import command
+from alembic.config import Config
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
-# Force test database for all tests
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+# In-memory SQLite: nothing touches disk, and each xdist worker process gets its own
+TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-# Override settings before importing anything else
+# Override settings before the app is imported; get_settings() is read at import time
 os.environ["DATABASE_URL"] = TEST_DATABASE_URL
 os.environ["SECRET_KEY"] = "test-secret-key-for-testing-only-must-be-long-enough-32-chars"
+os.environ["ALGORITHM"] = "HS256"
 os.environ["API_KEY"] = "123456"
 os.environ["DEBUG"] = "true"
 
-# Create test engine
+import main  # noqa: E402
+from app import auth, database  # noqa: E402
+from app.database import Base, get_db, get_db_ro  # noqa: E402
+from main import app  # noqa: E402
+from tests.test_helpers import generate_random_user, signup_and_login  # noqa: E402
+
+# Create test engine; StaticPool keeps the one connection that holds the database
 test_engine = create_async_engine(
     TEST_DATABASE_URL,
     echo=True,  # Set to False to reduce output
-    future=True
+    future=True,
+    poolclass=StaticPool,
+    connect_args={"check_same_thread": False}
 )
 
-TestSessionLocal = sessionmaker(
-    test_engine,
-    class_=AsyncSession,
-    expire_on_commit=False
-)
+
+# The sqlite driver's own transaction handling drops SAVEPOINTs; let SQLAlchemy
+# emit BEGIN itself so each test can run inside one rolled-back transaction
+@event.listens_for(test_engine.sync_engine, "connect")
+def _disable_driver_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(test_engine.sync_engine, "begin")
+def _begin_transaction(conn):
+    conn.exec_driver_sql("BEGIN")
 
 
 @pytest.fixture(scope="session")
@@ -41,67 +57,118 @@ def event_loop():
 
 
 @pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """Hash passwords at bcrypt's minimum cost for the test session"""
+    fast_context = auth.pwd_context.copy(bcrypt__rounds=4)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(auth, "pwd_context", fast_context)
+        mp.setattr(main, "DUMMY_PASSWORD_HASH", fast_context.hash("dummy-password-for-unknown-users"))
+        yield
+
+
+def run_migrations(connection):
+    """Upgrade the database behind this connection to head"""
+    alembic_cfg = Config("alembic.ini")
+    alembic_cfg.attributes["connection"] = connection
+    command.upgrade(alembic_cfg, "head")
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
 async def setup_database():
-    """Setup test database with migrations."""
-    # Remove test database if exists
-    if os.path.exists("test.db"):
-        os.remove("test.db")
-
-    # Run migrations using alembic
-    env = os.environ.copy()
-    env["DATABASE_URL"] = "sqlite:///./test.db"
-
-    result = run(
-        ["alembic", "upgrade", "head"],
-        env=env,
-        stdout=PIPE,
-        stderr=PIPE,
-        text=True
-    )
-
-    if result.returncode != 0:
-        print(f"Migration failed!")
-        print(f"STDOUT: {result.stdout}")
-        print(f"STDERR: {result.stderr}")
+    """Setup test database with migrations, once per session."""
+    try:
+        async with test_engine.connect() as conn:
+            await conn.run_sync(run_migrations)
+            await conn.commit()
+        print("Migrations applied successfully")
+    except Exception as e:
+        print(f"Migration failed: {e}")
 
         # Fallback: create tables directly if migrations fail
         print("Falling back to direct table creation...")
         async with test_engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
-    else:
-        print("Migrations applied successfully")
 
     yield
 
     # Cleanup
     await test_engine.dispose()
 
-    # Remove test database after all tests
-    if os.path.exists("test.db"):
-        os.remove("test.db")
 
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """One HTTP client and ASGI transport shared by the whole session."""
+    # ASGITransport never sends lifespan events; run startup/shutdown once here instead
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            yield c
 
-@pytest.fixture
+
+@pytest_asyncio.fixture(scope="session")
+async def shared_auth(client):
+    """One registered user and their headers, for tests that need any user"""
+    # Committed outside the per-test rollback so the user outlives every test
+    async with AsyncSession(test_engine, expire_on_commit=False) as session:
+        async def override_get_db():
+            yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_ro] = override_get_db
+        user_data = generate_random_user()
+        headers = await signup_and_login(client, user_data)
+        app.dependency_overrides.clear()
+
+    return user_data, headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def authed_client(shared_auth):
+    """A session client that sends the shared user's headers on every request"""
+    _, headers = shared_auth
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test", headers=headers) as c:
+        yield c
+
+
+@pytest_asyncio.fixture
 async def db_session():
-    """Get a test database session."""
-    async with TestSessionLocal() as session:
+    """Get a test database session whose writes are rolled back after the test."""
+    async with test_engine.connect() as conn:
+        transaction = await conn.begin()
+        # Endpoint commits only release a SAVEPOINT inside the outer transaction
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint"
+        )
+
         yield session
 
+        await session.close()
+        await transaction.rollback()
+
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
+def app_sessions(db_session, monkeypatch):
+    """Run the app's real get_db/get_db_ro, with their sessions on the test transaction"""
+    for factory_name in ("AsyncSessionLocal", "AsyncSessionReadOnly"):
+        factory = getattr(database, factory_name)
+        monkeypatch.setattr(database, factory_name, async_sessionmaker(
+            **{**factory.kw, "bind": db_session.bind, "join_transaction_mode": "create_savepoint"}
+        ))
+    app.dependency_overrides.pop(get_db)
+    app.dependency_overrides.pop(get_db_ro)
+
+
+@pytest_asyncio.fixture(autouse=True)
 async def setup_test(db_session):
     # Override the get_db dependency
     async def override_get_db():
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db_ro] = override_get_db
 
     yield
 
-    # Cleanup after each test - clear all data but keep schema
-    for table in reversed(Base.metadata.sorted_tables):
-        await db_session.execute(table.delete())
-    await db_session.commit()
-
     # Clear dependency overrides
     app.dependency_overrides.clear()
@@ -0,0 +1,142 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.routing import APIRoute
+from httpx import AsyncClient, ASGITransport
+import main
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from app.config import DEFAULT_SECRET_KEY, Settings
+from app.database import _engine_options
+from main import app
+
+
+def test_routes_registered_once():
+    """Test that every route and middleware is registered exactly once"""
+    routes = [
+        (route.path, method)
+        for route in app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+    ]
+    assert len(routes) == len(set(routes))
+
+    middleware = [m.cls for m in app.user_middleware]
+    assert len(middleware) == len(set(middleware))
+
+
+def test_multiple_workers_need_secret_key(monkeypatch):
+    """Test that several workers refuse to start with a generated SECRET_KEY"""
+    monkeypatch.setattr(main, "get_settings", lambda: Settings(SECRET_KEY=DEFAULT_SECRET_KEY))
+    with pytest.raises(RuntimeError):
+        main.check_worker_secret_key(2)
+    main.check_worker_secret_key(1)
+
+    monkeypatch.setattr(main, "get_settings", lambda: Settings(SECRET_KEY="a-configured-secret-key-of-32-chars"))
+    main.check_worker_secret_key(2)
+
+
+def test_openapi_declares_api_key():
+    """Test that the /tasks operations document the X-API-Key header"""
+    schema = app.openapi()
+
+    assert schema["components"]["securitySchemes"]["APIKeyHeader"] == {
+        "type": "apiKey", "in": "header", "name": "X-API-Key"
+    }
+    for path, operations in schema["paths"].items():
+        for operation in operations.values():
+            requirements = operation.get("security", [])
+            if path.startswith("/tasks"):
+                assert requirements
+                assert all({"APIKeyHeader", "OAuth2PasswordBearer"} <= set(r) for r in requirements)
+            else:
+                assert not any("APIKeyHeader" in r for r in requirements)
+
+
+def test_sqlite_engine_pooling():
+    """Test that file SQLite gets a real pool and only :memory: shares one connection"""
+    assert _engine_options("sqlite+aiosqlite:///./data/tasks.db")["poolclass"] is AsyncAdaptedQueuePool
+    assert _engine_options("sqlite+aiosqlite:///:memory:")["poolclass"] is StaticPool
+
+
+def test_launched_worker_count(monkeypatch):
+    """Test that the worker count is read from uvicorn's flag before WEB_CONCURRENCY"""
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert main.launched_worker_count(["uvicorn", "main:app", "--workers", "4"]) == 4
+    assert main.launched_worker_count(["uvicorn", "main:app", "--workers=2"]) == 2
+    assert main.launched_worker_count(["uvicorn", "main:app"]) == 3
+
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    assert main.launched_worker_count(["uvicorn", "main:app"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_health_check_cached_only_when_healthy(client, monkeypatch):
+    """Test that /health reuses a healthy result briefly and never caches a failure"""
+    monkeypatch.setattr(main, "_last_health", (0.0, {}))
+    opened = []
+    healthy_factory = main.AsyncSessionLocal
+
+    def counting_factory():
+        opened.append(True)
+        return healthy_factory()
+
+    def failing_factory():
+        opened.append(True)
+        raise SQLAlchemyError("database down")
+
+    monkeypatch.setattr(main, "AsyncSessionLocal", counting_factory)
+    assert (await client.get("/health")).status_code == 200
+    assert (await client.get("/health")).status_code == 200
+    assert len(opened) == 1
+
+    # An unhealthy result is reported again on the next call, not cached
+    monkeypatch.setattr(main, "_last_health", (0.0, {}))
+    monkeypatch.setattr(main, "AsyncSessionLocal", failing_factory)
+    assert (await client.get("/health")).status_code == 503
+    assert (await client.get("/health")).status_code == 503
+    assert len(opened) == 3
+
+    monkeypatch.setattr(main, "AsyncSessionLocal", counting_factory)
+    assert (await client.get("/health")).status_code == 200
+    assert len(opened) == 4
+
+
+@pytest.mark.asyncio
+async def test_optional_middleware():
+    """Test that CORS and host checking are added only when configured"""
+    unconfigured = FastAPI()
+    main.add_optional_middleware(unconfigured, Settings(CORS_ORIGINS=[], ALLOWED_HOSTS=[]))
+    assert unconfigured.user_middleware == []
+    assert CORSMiddleware not in [m.cls for m in app.user_middleware]
+
+    configured = FastAPI()
+
+    @configured.get("/ping")
+    async def ping():
+        return {}
+
+    main.add_optional_middleware(configured, Settings(
+        CORS_ORIGINS=["https://app.example.com"], ALLOWED_HOSTS=["test"]
+    ))
+    assert {m.cls for m in configured.user_middleware} == {CORSMiddleware, TrustedHostMiddleware}
+
+    async with AsyncClient(transport=ASGITransport(app=configured), base_url="http://test") as c:
+        response = await c.options("/ping", headers={
+            "Origin": "https://app.example.com",
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "X-API-Key",
+        })
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "https://app.example.com"
+        assert response.headers["access-control-allow-credentials"] == "true"
+        assert "X-API-Key" in response.headers["access-control-allow-headers"]
+
+        response = await c.options("/ping", headers={
+            "Origin": "https://evil.example.com",
+            "Access-Control-Request-Method": "GET",
+        })
+        assert "access-control-allow-origin" not in response.headers
+
+        response = await c.get("/ping", headers={"Host": "other.example.com"})
+        assert response.status_code == 400
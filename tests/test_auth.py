@@ -1,68 +1,128 @@
+import hashlib
 import pytest
-from httpx import AsyncClient, ASGITransport
-from main import app
-from tests.test_helpers import generate_random_user, user_manager
+from app import auth
+from app.models import User
+import main
+from main import auth_cache
+from tests.test_helpers import generate_random_user, signup_and_login
 
 
 @pytest.mark.asyncio
-async def test_signup():
+async def test_signup(client):
     """Test user registration"""
     # Generate random user to avoid conflicts
     user_data = generate_random_user()
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        response = await ac.post("/signup", json=user_data)
+    response = await client.post("/signup", json=user_data)
 
     assert response.status_code == 201
-    assert response.json()["username"] == user_data["username"]
-    assert "id" in response.json()
+    body = response.json()
+    assert body["username"] == user_data["username"]
+    assert "id" in body
 
 
 @pytest.mark.asyncio
-async def test_signup_duplicate_username():
+async def test_signup_duplicate_username(client, db_session):
     """Test registration with duplicate username"""
     # Generate random user
     user_data = generate_random_user()
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        # First registration
-        response1 = await ac.post("/signup", json=user_data)
-        assert response1.status_code == 201
+    # Seed the existing user directly; the first signup is not what is under test
+    db_session.add(User(username=user_data["username"], hashed_password="not-a-real-hash"))
+    await db_session.commit()
 
-        # Duplicate registration (same username)
-        response2 = await ac.post("/signup", json=user_data)
+    # Duplicate registration (same username)
+    response = await client.post("/signup", json=user_data)
 
-    assert response2.status_code == 400
-    assert "already registered" in response2.json()["detail"]
+    assert response.status_code == 400
+    assert "already registered" in response.json()["detail"]
 
 
 @pytest.mark.asyncio
-async def test_login():
+async def test_login(client):
     """Test user login"""
     # Generate random user
     user_data = generate_random_user()
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        # Register user first
-        signup_response = await ac.post("/signup", json=user_data)
-        assert signup_response.status_code == 201
+    # Register user first
+    signup_response = await client.post("/signup", json=user_data)
+    assert signup_response.status_code == 201
 
-        # Login
-        response = await ac.post("/token", data=user_data)
+    # Login
+    response = await client.post("/token", data=user_data)
 
     assert response.status_code == 200
-    assert "access_token" in response.json()
-    assert response.json()["token_type"] == "bearer"
+    body = response.json()
+    assert "access_token" in body
+    assert body["token_type"] == "bearer"
 
 
 @pytest.mark.asyncio
-async def test_login_invalid_credentials():
+async def test_login_invalid_credentials(client):
     """Test login with invalid credentials"""
     # Use random credentials that don't exist
     fake_user = generate_random_user()
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        response = await ac.post("/token", data=fake_user)
+    response = await client.post("/token", data=fake_user)
 
     assert response.status_code == 401
     assert "Incorrect username or password" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_verified_token_is_cached(client, monkeypatch):
+    """Test that verified token claims are served from the auth cache"""
+    user_data = generate_random_user()
+    headers = await signup_and_login(client, user_data)
+
+    verified = []
+    original_verify_token = main.verify_token
+
+    def recording_verify_token(token):
+        verified.append(token)
+        return original_verify_token(token)
+
+    monkeypatch.setattr(main, "verify_token", recording_verify_token)
+
+    response = await client.get("/tasks", headers=headers)
+    assert response.status_code == 200
+
+    token = headers["Authorization"].removeprefix("Bearer ")
+    cache_key = hashlib.sha256(token.encode()).digest()
+    assert auth_cache[cache_key].username == user_data["username"]
+
+    # Served from the cache on the next request, without decoding the JWT again
+    response = await client.get("/tasks", headers=headers)
+    assert response.status_code == 200
+    assert verified == [token]
+
+
+@pytest.mark.asyncio
+async def test_repeat_login_uses_cache_but_checks_password(client, monkeypatch):
+    """Test that cached logins skip bcrypt but still reject a wrong password"""
+    user_data = generate_random_user()
+
+    await client.post("/signup", json=user_data)
+
+    verified = []
+    original_verify_password = auth.verify_password
+
+    def recording_verify_password(plain_password, hashed_password):
+        verified.append(plain_password)
+        return original_verify_password(plain_password, hashed_password)
+
+    monkeypatch.setattr(auth, "verify_password", recording_verify_password)
+
+    first = await client.post("/token", data=user_data)
+    assert first.status_code == 200
+    assert verified == [user_data["password"]]
+
+    # Served from the login cache without another bcrypt check
+    second = await client.post("/token", data=user_data)
+    assert second.status_code == 200
+    assert verified == [user_data["password"]]
+
+    # A wrong password misses the cache and is checked with bcrypt
+    wrong = await client.post("/token", data={**user_data, "password": "wrong-password"})
+    assert wrong.status_code == 401
+    assert verified == [user_data["password"], "wrong-password"]
@@ -1,57 +1,41 @@
-import uuid
-import random
-import string
+import itertools
+import os
 from typing import Dict, Any
 
+# Per-process prefix plus a counter: unique names without a uuid4() per call
+_rand = os.urandom(8).hex()
+_counter = itertools.count()
 
-def generate_random_user() -> Dict[str, str]:
-    """Generate a random user with unique username and password"""
-    # Create unique username with timestamp-like suffix
-    random_suffix = ''.join(random.choices(string.digits, k=6))
-    username = f"user_{uuid.uuid4().hex[:8]}_{random_suffix}"
+# Matches the API_KEY that conftest sets for the app
+API_KEY_HEADERS = {"X-API-Key": "123456"}
 
-    # Generate random password
-    password = f"pass_{uuid.uuid4().hex[:12]}"
+_STATUSES = ("pending", "completed")
 
+
+def generate_random_user() -> Dict[str, str]:
+    """Generate a random user with unique username and password"""
+    suffix = next(_counter)
     return {
-        "username": username,
-        "password": password
+        "username": f"user_{_rand}_{suffix}",
+        "password": f"pass_{suffix}"
     }
 
 
+async def signup_and_login(client, user_data: Dict[str, str]) -> Dict[str, str]:
+    """Register a user, log in and return headers for the task endpoints"""
+    await client.post("/signup", json=user_data)
+    login_response = await client.post("/token", data=user_data)
+
+    return {**API_KEY_HEADERS, "Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+
 def generate_random_task(title_prefix: str = "Task") -> Dict[str, Any]:
     """Generate a random task with unique title"""
-    random_id = uuid.uuid4().hex[:8]
+    suffix = next(_counter)
+    random_id = f"{_rand}_{suffix}"
     return {
         "title": f"{title_prefix}_{random_id}",
         "description": f"Test description for {title_prefix}_{random_id}",
-        "status": random.choice(["pending", "completed"])
+        "status": _STATUSES[suffix & 1]
     }
 
-
-class UserManager:
-    """Manages test users to avoid conflicts"""
-
-    def __init__(self):
-        self.created_users = []
-
-    def create_user(self, prefix: str = "testuser") -> Dict[str, str]:
-        """Create a unique test user"""
-        user = {
-            "username": f"{prefix}_{uuid.uuid4().hex[:8]}",
-            "password": f"testpass_{uuid.uuid4().hex[:8]}"
-        }
-        self.created_users.append(user)
-        return user
-
-    def get_random_user(self) -> Dict[str, str]:
-        """Get a completely random user"""
-        return generate_random_user()
-
-    def cleanup(self):
-        """Clear created users list"""
-        self.created_users.clear()
-
-
-# Global instance for convenience
-user_manager = UserManager()
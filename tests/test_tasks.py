@@ -1,158 +1,275 @@
 import pytest
-from httpx import AsyncClient, ASGITransport
-from main import app
-from tests.test_helpers import generate_random_user, generate_random_task
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db_ro
+from app.models import Task
+from app.schemas import TaskCreate
+from tests.test_helpers import API_KEY_HEADERS, generate_random_user, generate_random_task, signup_and_login
 
 
 @pytest.mark.asyncio
-async def test_create_task():
+async def test_create_task(authed_client):
     """Test task creation"""
-    # Generate random user and task
-    user_data = generate_random_user()
     task_data = generate_random_task("CreateTest")
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        # Register and login user
-        await ac.post("/signup", json=user_data)
-
-        login_response = await ac.post("/token", data=user_data)
-        token = login_response.json()["access_token"]
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-API-Key": "123456"
-        }
-
-        # Create task
-        response = await ac.post("/tasks", json=task_data, headers=headers)
+    # Create task
+    response = await authed_client.post("/tasks", json=task_data)
 
     assert response.status_code == 201
-    assert response.json()["title"] == task_data["title"]
-    assert response.json()["description"] == task_data["description"]
-    assert response.json()["status"] == task_data["status"]
+    body = response.json()
+    assert body["title"] == task_data["title"]
+    assert body["description"] == task_data["description"]
+    assert body["status"] == task_data["status"]
 
 
 @pytest.mark.asyncio
-async def test_get_tasks():
+async def test_get_tasks(authed_client):
     """Test getting user tasks"""
-    # Generate random user and task
-    user_data = generate_random_user()
     task_data = generate_random_task("GetTest")
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        # Register and login user
-        await ac.post("/signup", json=user_data)
+    # Create a task first
+    await authed_client.post("/tasks", json=task_data)
 
-        login_response = await ac.post("/token", data=user_data)
-        token = login_response.json()["access_token"]
+    # Get tasks
+    response = await authed_client.get("/tasks")
 
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-API-Key": "123456"
-        }
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body) == 1
+    assert body[0]["title"] == task_data["title"]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_on_read_only_session(authed_client, app_sessions):
+    """Test listing tasks through the real read-only session"""
+    # asyncpg can only stream inside a transaction, so the session must not autocommit
+    async for session in get_db_ro():
+        connection = await session.connection()
+        assert connection.sync_connection.get_execution_options().get("isolation_level") != "AUTOCOMMIT"
+        assert session.in_transaction()
 
-        # Create a task first
-        await ac.post("/tasks", json=task_data, headers=headers)
+    task_data = generate_random_task("ReadOnlyTest")
+    await authed_client.post("/tasks", json=task_data)
 
-        # Get tasks
-        response = await ac.get("/tasks", headers=headers)
+    response = await authed_client.get("/tasks")
 
     assert response.status_code == 200
-    assert len(response.json()) == 1
-    assert response.json()[0]["title"] == task_data["title"]
+    body = response.json()
+    assert len(body) == 1
+    assert body[0]["title"] == task_data["title"]
 
 
 @pytest.mark.asyncio
-async def test_user_isolation():
+async def test_database_error_rolls_back(authed_client, app_sessions, db_session, monkeypatch):
+    """Test that a failing write returns 500 and rolls the session back"""
+    task_data = generate_random_task("FailedWrite")
+    written_before_commit = []
+
+    async def failing_commit(self):
+        # The insert reached the test database before the commit failed
+        written_before_commit.append(
+            await self.scalar(select(Task.id).where(Task.title == task_data["title"]))
+        )
+        raise SQLAlchemyError("commit failed")
+
+    rolled_back = []
+    original_rollback = AsyncSession.rollback
+
+    async def recording_rollback(self):
+        rolled_back.append(self)
+        await original_rollback(self)
+
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+    monkeypatch.setattr(AsyncSession, "rollback", recording_rollback)
+
+    response = await authed_client.post("/tasks", json=task_data)
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Database error"}
+    assert written_before_commit[0] is not None
+    assert len(rolled_back) == 1
+
+    # get_db's rollback took the inserted row with it
+    assert await db_session.scalar(select(Task.id).where(Task.title == task_data["title"])) is None
+
+
+@pytest.mark.asyncio
+async def test_user_isolation(client):
     """Test that users can only see their own tasks"""
     # Generate two different users
     user1_data = generate_random_user()
     user2_data = generate_random_user()
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        # Register both users
-        await ac.post("/signup", json=user1_data)
-        await ac.post("/signup", json=user2_data)
-
-        # Login both users
-        user1_login = await ac.post("/token", data=user1_data)
-        user2_login = await ac.post("/token", data=user2_data)
-
-        user1_headers = {
-            "Authorization": f"Bearer {user1_login.json()['access_token']}",
-            "X-API-Key": "123456"
-        }
-        user2_headers = {
-            "Authorization": f"Bearer {user2_login.json()['access_token']}",
-            "X-API-Key": "123456"
-        }
-
-        # User 1 creates a task
-        user1_task = generate_random_task("User1Task")
-        await ac.post("/tasks", json=user1_task, headers=user1_headers)
-
-        # User 2 creates a task
-        user2_task = generate_random_task("User2Task")
-        await ac.post("/tasks", json=user2_task, headers=user2_headers)
-
-        # User 1 should only see their own task
-        user1_tasks = await ac.get("/tasks", headers=user1_headers)
-        assert user1_tasks.status_code == 200
-        user1_data_response = user1_tasks.json()
-        assert len(user1_data_response) == 1
-        assert user1_data_response[0]["title"] == user1_task["title"]
-
-        # User 2 should only see their own task
-        user2_tasks = await ac.get("/tasks", headers=user2_headers)
-        assert user2_tasks.status_code == 200
-        user2_data_response = user2_tasks.json()
-        assert len(user2_data_response) == 1
-        assert user2_data_response[0]["title"] == user2_task["title"]
+    # Register and login both users
+    user1_headers = await signup_and_login(client, user1_data)
+    user2_headers = await signup_and_login(client, user2_data)
+
+    # User 1 creates a task
+    user1_task = generate_random_task("User1Task")
+    await client.post("/tasks", json=user1_task, headers=user1_headers)
+
+    # User 2 creates a task
+    user2_task = generate_random_task("User2Task")
+    await client.post("/tasks", json=user2_task, headers=user2_headers)
+
+    # User 1 should only see their own task
+    user1_tasks = await client.get("/tasks", headers=user1_headers)
+    assert user1_tasks.status_code == 200
+    user1_data_response = user1_tasks.json()
+    assert len(user1_data_response) == 1
+    assert user1_data_response[0]["title"] == user1_task["title"]
+
+    # User 2 should only see their own task
+    user2_tasks = await client.get("/tasks", headers=user2_headers)
+    assert user2_tasks.status_code == 200
+    user2_data_response = user2_tasks.json()
+    assert len(user2_data_response) == 1
+    assert user2_data_response[0]["title"] == user2_task["title"]
 
 
 @pytest.mark.asyncio
-async def test_unauthorized_access():
+async def test_unauthorized_access(client):
     """Test unauthorized access to protected endpoints"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        # Try to access tasks without token
-        response = await ac.get("/tasks")
-        assert response.status_code == 401
+    # Try to access tasks without token
+    response = await client.get("/tasks")
+    assert response.status_code == 401
 
-        # Try to access tasks without API key
-        response = await ac.get("/tasks", headers={
-            "Authorization": "Bearer invalid-token"
-        })
-        assert response.status_code == 401
+    # Try to access tasks without API key
+    response = await client.get("/tasks", headers={
+        "Authorization": "Bearer invalid-token"
+    })
+    assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_task_validation():
+def test_task_validation():
     """Test task input validation"""
-    # Generate random user
-    user_data = generate_random_user()
-
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        # Register and login user
-        await ac.post("/signup", json=user_data)
-
-        login_response = await ac.post("/token", data=user_data)
-        token = login_response.json()["access_token"]
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-API-Key": "123456"
-        }
-
-        # Test empty title
-        response = await ac.post("/tasks", json={
-            "title": "",  # Empty title
-            "description": "Valid description"
-        }, headers=headers)
-        assert response.status_code == 422
-
-        # Test invalid status
-        response = await ac.post("/tasks", json={
-            "title": "Valid title",
-            "status": "invalid_status"
-        }, headers=headers)
-        assert response.status_code == 422
+    # Checked on the schema directly; the HTTP 422 mapping is covered elsewhere
+    with pytest.raises(ValidationError):
+        TaskCreate(title="", description="Valid description")
+
+    with pytest.raises(ValidationError):
+        TaskCreate(title="Valid title", status="invalid_status")
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_pagination(authed_client):
+    """Test paging through tasks with limit and cursor"""
+    # Tasks created within the same second share created_at
+    for _ in range(3):
+        await authed_client.post("/tasks", json=generate_random_task("PageTest"))
+
+    first_page = await authed_client.get("/tasks", params={"limit": 2})
+    assert first_page.status_code == 200
+    first_tasks = first_page.json()
+    assert len(first_tasks) == 2
+
+    cursor = first_tasks[-1]["id"]
+    second_page = await authed_client.get("/tasks", params={"limit": 2, "cursor": cursor})
+    assert second_page.status_code == 200
+    second_tasks = second_page.json()
+    assert len(second_tasks) == 1
+
+    first_ids = {task["id"] for task in first_tasks}
+    assert second_tasks[0]["id"] not in first_ids
+
+    # Paging past the last task returns an empty page
+    cursor = second_tasks[-1]["id"]
+    last_page = await authed_client.get("/tasks", params={"limit": 2, "cursor": cursor})
+    assert last_page.status_code == 200
+    assert last_page.json() == []
+
+    # Limit is bounded
+    response = await authed_client.get("/tasks", params={"limit": 1000})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_invalid_cursor(client, authed_client):
+    """Test that a deleted or foreign cursor task is rejected, not an empty page"""
+    for _ in range(2):
+        await authed_client.post("/tasks", json=generate_random_task("CursorTest"))
+
+    first_page = (await authed_client.get("/tasks", params={"limit": 1})).json()
+    cursor = first_page[-1]["id"]
+    await authed_client.delete(f"/tasks/{cursor}")
+
+    response = await authed_client.get("/tasks", params={"limit": 1, "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+    # Another user's task id cannot be used as a cursor either
+    other_headers = await signup_and_login(client, generate_random_user())
+    other_task = (await client.post("/tasks", json=generate_random_task("Other"), headers=other_headers)).json()
+
+    response = await authed_client.get("/tasks", params={"cursor": other_task["id"]})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_task(client):
+    """Test updating and deleting a task, and that other users cannot"""
+    owner_data = generate_random_user()
+    other_data = generate_random_user()
+
+    # Register and login both users
+    owner_headers = await signup_and_login(client, owner_data)
+    other_headers = await signup_and_login(client, other_data)
+
+    task_data = generate_random_task("UpdateTest")
+    task_id = (await client.post("/tasks", json=task_data, headers=owner_headers)).json()["id"]
+
+    # Another user can neither update nor delete the task
+    response = await client.put(f"/tasks/{task_id}", json={"title": "Hijacked"}, headers=other_headers)
+    assert response.status_code == 404
+    response = await client.delete(f"/tasks/{task_id}", headers=other_headers)
+    assert response.status_code == 404
+
+    # Only the fields sent are changed
+    response = await client.put(f"/tasks/{task_id}", json={"status": "completed"}, headers=owner_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "completed"
+    assert body["title"] == task_data["title"]
+
+    # An empty update returns the task unchanged
+    response = await client.put(f"/tasks/{task_id}", json={}, headers=owner_headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+
+    response = await client.delete(f"/tasks/{task_id}", headers=owner_headers)
+    assert response.status_code == 200
+
+    response = await client.get(f"/tasks/{task_id}", headers=owner_headers)
+    assert response.status_code == 404
+    response = await client.delete(f"/tasks/{task_id}", headers=owner_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_wrong_api_key(client, authed_client):
+    """Test that a valid token is rejected without the right API key"""
+    response = await authed_client.get("/tasks", headers={"X-API-Key": "wrong-key"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid or missing API key"
+
+    # Public endpoints need no API key
+    response = await client.get("/")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_api_key_checked_before_token(client):
+    """Test that a bad API key is rejected before the token is looked at"""
+    response = await client.get("/tasks", headers={
+        "Authorization": "Bearer not-a-jwt",
+        "X-API-Key": "wrong-key"
+    })
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid or missing API key"
+
+    # With the right key the token is checked next
+    response = await client.get("/tasks", headers={**API_KEY_HEADERS, "Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Could not validate credentials"